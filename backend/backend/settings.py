@@ -10,8 +10,11 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
+from .database import sqlite_database
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -75,11 +78,17 @@ WSGI_APPLICATION = 'backend.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# SQLite is tuned for several gunicorn workers sharing one file (WAL, busy
+# timeout, persistent connections); see backend/database.py.
+# SQLITE_TUNING=false restores the stock configuration.
+
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    'default': sqlite_database(
+        os.getenv('SQLITE_PATH', BASE_DIR / 'db.sqlite3'),
+        tuned=os.getenv('SQLITE_TUNING', 'true').lower() in ('1', 'true', 'yes'),
+        timeout=float(os.getenv('SQLITE_BUSY_TIMEOUT', '20')),
+        conn_max_age=int(os.getenv('SQLITE_CONN_MAX_AGE', '600')),
+    )
 }
 
 
@@ -124,3 +133,10 @@ STATIC_URL = 'static/'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 CORS_ALLOW_ALL_ORIGINS = True
+
+# Research gathering: fetch full pages behind SerpAPI results instead of
+# keeping only the snippets. Off by default since it adds network time.
+RESEARCH_FETCH_PAGES = os.getenv("RESEARCH_FETCH_PAGES", "false").lower() in ("1", "true", "yes")
+RESEARCH_FETCH_WORKERS = int(os.getenv("RESEARCH_FETCH_WORKERS", "4"))
+RESEARCH_FETCH_MAX_BYTES = int(os.getenv("RESEARCH_FETCH_MAX_BYTES", str(512 * 1024)))
+RESEARCH_FETCH_TIMEOUT = float(os.getenv("RESEARCH_FETCH_TIMEOUT", "8"))
@@ -3,14 +3,17 @@ from ..models import Document, Summary
 def store_documents(query_obj, gathered_docs):
     """
     Saves gathered documents under the given Query object.
+    Inserted in one statement so the SQLite write lock is taken only once.
     """
-    for d in gathered_docs:
-        Document.objects.create(
+    Document.objects.bulk_create([
+        Document(
             query=query_obj,
             source=d.get("source", "Unknown"),
             url=d.get("url", ""),
             content=d.get("content", ""),
         )
+        for d in gathered_docs
+    ])
 
 def store_summary(query_obj, summary_text, summary_type="medium"):
     """
@@ -0,0 +1,266 @@
+import codecs
+import time
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import HTTPError, ProtocolError, ReadTimeoutError
+
+# Containers whose text never belongs to the main content of a page. Only
+# elements that always get an explicit end tag belong here: skipping lasts
+# until the matching end tag.
+_SKIP_TAGS = {
+    "script", "style", "noscript", "template", "svg", "canvas", "iframe",
+    "title", "nav", "header", "footer", "aside", "button", "select",
+}
+# Elements allowed inside <head>; any other start tag implicitly closes it,
+# since </head> (and <body>) are optional.
+_HEAD_TAGS = {
+    "head", "title", "meta", "link", "style", "script", "base", "noscript",
+    "template",
+}
+# Void elements never get an end tag.
+_VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link",
+    "meta", "param", "source", "track", "wbr",
+}
+_BLOCK_TAGS = {
+    "p", "div", "section", "article", "main", "li", "ul", "ol", "br", "tr",
+    "table", "blockquote", "pre", "h1", "h2", "h3", "h4", "h5", "h6",
+}
+
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_MAX_BYTES = 512 * 1024
+DEFAULT_TIMEOUT = 8.0
+DEFAULT_MAX_CHARS = 20000
+_CHUNK_SIZE = 16 * 1024
+
+
+class _TextExtractor(HTMLParser):
+    """
+    Streaming HTML-to-text pass: text is collected as chunks are fed,
+    without building a DOM. Boilerplate containers are skipped.
+    """
+
+    def __init__(self, max_chars: int = DEFAULT_MAX_CHARS):
+        super().__init__(convert_charrefs=True)
+        self.max_chars = max_chars
+        self._in_head = False
+        # Outermost skipped container and how many of that tag are open.
+        self._skip_tag = None
+        self._skip_depth = 0
+        self._parts = []
+        self._current = []
+        self._size = 0
+
+    @property
+    def full(self):
+        return self._size >= self.max_chars
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "head":
+            self._in_head = True
+        elif tag not in _HEAD_TAGS:
+            self._in_head = False
+        if self._skip_tag:
+            if tag == self._skip_tag:
+                self._skip_depth += 1
+            return
+        if tag in _VOID_TAGS:
+            if tag in _BLOCK_TAGS:
+                self._flush()
+            return
+        if tag in _SKIP_TAGS:
+            self._flush()
+            self._skip_tag = tag
+            self._skip_depth = 1
+        elif tag in _BLOCK_TAGS:
+            self._flush()
+
+    def handle_startendtag(self, tag, attrs):
+        if not self._skip_tag and tag in _BLOCK_TAGS:
+            self._flush()
+
+    def handle_endtag(self, tag):
+        if tag == "head":
+            self._in_head = False
+        if self._skip_tag:
+            if tag == self._skip_tag:
+                self._skip_depth -= 1
+                if not self._skip_depth:
+                    self._skip_tag = None
+            return
+        if tag in _BLOCK_TAGS:
+            self._flush()
+
+    def handle_data(self, data):
+        if self._skip_tag or self._in_head or self.full:
+            return
+        self._current.append(data)
+
+    def _flush(self):
+        if not self._current:
+            return
+        line = " ".join("".join(self._current).split())
+        self._current = []
+        # Very short blocks are usually menu items, buttons or captions.
+        if len(line.split()) < 4 or self.full:
+            return
+        self._parts.append(line)
+        self._size += len(line) + 1
+
+    def text(self):
+        self._flush()
+        return "\n".join(self._parts)[: self.max_chars]
+
+
+def _feed(parser, data):
+    """
+    Feed `data` into the parser (or close it when `data` is None). html.parser
+    raises plain AssertionErrors and friends on malformed markup such as
+    `<![bogus[`; surface them as ValueError so the page counts as a failed
+    fetch instead of aborting the whole batch.
+    """
+    try:
+        if data is None:
+            parser.close()
+        else:
+            parser.feed(data)
+    except Exception as e:
+        raise ValueError(f"unparseable HTML: {e}") from e
+
+
+def _set_read_timeout(resp, seconds):
+    """
+    Bound the next socket read to `seconds`. requests applies its read
+    timeout to each read separately, so a server trickling a few bytes at a
+    time could otherwise hold the fetch open indefinitely.
+    """
+    conn = getattr(resp.raw, "connection", None)
+    sock = getattr(conn, "sock", None)
+    if sock is not None:
+        sock.settimeout(max(seconds, 0.001))
+
+
+def fetch_page_text(url: str, max_bytes: int = DEFAULT_MAX_BYTES,
+                    timeout: float = DEFAULT_TIMEOUT,
+                    max_chars: int = DEFAULT_MAX_CHARS,
+                    session=None):
+    """
+    Stream a single page and return (text, stats).
+
+    The body is read as it arrives and fed straight into the extractor, so at
+    most `max_bytes` are downloaded and the whole fetch is bounded by
+    `timeout` seconds of wall-clock time: connecting and waiting for the
+    headers get half of it each, and body reads stop at the deadline,
+    keeping the text parsed so far. `text` is "" on any failure.
+    """
+    http = session or requests
+    started = time.perf_counter()
+    deadline = started + timeout
+    stats = {"url": url, "bytes": 0, "elapsed_ms": 0.0, "truncated": False, "error": None}
+    parser = _TextExtractor(max_chars=max_chars)
+    text = ""
+    try:
+        with http.get(
+            url,
+            stream=True,
+            timeout=(timeout / 2, timeout / 2),
+            headers={"User-Agent": "ResearchGatheringAgent/1.0"},
+        ) as resp:
+            resp.raise_for_status()
+            ctype = resp.headers.get("Content-Type", "")
+            if ctype and "html" not in ctype and not ctype.startswith("text/"):
+                raise ValueError(f"unsupported content type {ctype!r}")
+
+            # requests assumes ISO-8859-1 when no charset is declared; most
+            # pages without one are UTF-8 in practice.
+            encoding = resp.encoding if "charset" in ctype.lower() else "utf-8"
+            decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+            while True:
+                remaining_time = deadline - time.perf_counter()
+                if remaining_time <= 0:
+                    stats["truncated"] = True
+                    break
+                _set_read_timeout(resp, remaining_time)
+                try:
+                    # read1 returns whatever has arrived instead of waiting
+                    # for a full chunk.
+                    chunk = resp.raw.read1(_CHUNK_SIZE, decode_content=True)
+                except (ReadTimeoutError, ProtocolError):
+                    if time.perf_counter() < deadline:
+                        raise
+                    stats["truncated"] = True
+                    break
+                if not chunk:
+                    break
+                remaining = max_bytes - stats["bytes"]
+                if len(chunk) >= remaining:
+                    chunk = chunk[:remaining]
+                    stats["truncated"] = True
+                stats["bytes"] += len(chunk)
+                _feed(parser, decoder.decode(chunk))
+                if stats["truncated"] or parser.full:
+                    break
+        _feed(parser, None)
+        text = parser.text()
+    except (requests.exceptions.RequestException, HTTPError, ValueError, LookupError) as e:
+        stats["error"] = str(e)
+    finally:
+        stats["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return text, stats
+
+
+def fetch_contents(documents, max_workers: int = DEFAULT_MAX_WORKERS,
+                   max_bytes: int = DEFAULT_MAX_BYTES,
+                   timeout: float = DEFAULT_TIMEOUT,
+                   max_chars: int = DEFAULT_MAX_CHARS):
+    """
+    Fetch the pages behind gathered documents with bounded concurrency and
+    replace each document's `content` with the extracted page text.
+
+    Documents keep their original snippet when the fetch fails or yields less
+    text than the snippet. Per-fetch timing is attached as `fetch_stats`.
+    """
+    targets = [d for d in documents if d.get("url", "").startswith(("http://", "https://"))]
+    if not targets:
+        return documents
+
+    def _fetch(doc, session):
+        return doc, fetch_page_text(
+            doc["url"], max_bytes=max_bytes, timeout=timeout,
+            max_chars=max_chars, session=session,
+        )
+
+    started = time.perf_counter()
+    with requests.Session() as session:
+        adapter = HTTPAdapter(pool_maxsize=max_workers)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+            futures = [(doc, pool.submit(_fetch, doc, session)) for doc in targets]
+            results = []
+            for doc, future in futures:
+                # Enrichment is optional: whatever goes wrong with one page,
+                # that document just keeps its snippet.
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    results.append((doc, ("", {
+                        "url": doc["url"], "bytes": 0, "elapsed_ms": 0.0,
+                        "truncated": False, "error": str(e) or type(e).__name__,
+                    })))
+
+    filled = 0
+    for doc, (text, stats) in results:
+        doc["fetch_stats"] = stats
+        if len(text) > len(doc.get("content", "") or ""):
+            doc["content"] = text
+            filled += 1
+        status = "failed: " + stats["error"] if stats["error"] else f"{stats['bytes']} bytes"
+        print(f"[PageFetcher] {doc['url']} -> {status} in {stats['elapsed_ms']} ms")
+
+    total_ms = round((time.perf_counter() - started) * 1000, 1)
+    print(f"[PageFetcher] ✅ Filled {filled}/{len(targets)} documents in {total_ms} ms.")
+    return documents
@@ -4,6 +4,8 @@ from dotenv import load_dotenv, find_dotenv
 from pathlib import Path
 from django.conf import settings
 
+from . import page_fetcher
+
 
 def _load_serpapi_env():
     """
@@ -41,11 +43,17 @@ def _load_serpapi_env():
 # -------------------------------
 # 2️⃣ SerpAPI Search Request
 # -------------------------------
-def gather(query_text: str, max_sources: int = 5):
+def gather(query_text: str, max_sources: int = 5, fetch_pages: bool = None):
     """
     Query SerpAPI to gather research data based on a query.
     Falls back to Wikipedia if SerpAPI is unavailable.
+
+    With `fetch_pages` (defaults to settings.RESEARCH_FETCH_PAGES) the linked
+    pages are fetched concurrently and their text replaces the short snippets.
     """
+    if fetch_pages is None:
+        fetch_pages = getattr(settings, "RESEARCH_FETCH_PAGES", False)
+
     key = _load_serpapi_env()
     if not key:
         print("[ResearchGatheringAgent] ⚠️ Missing SerpAPI key. Using Wikipedia fallback.")
@@ -78,6 +86,13 @@ def gather(query_text: str, max_sources: int = 5):
             }
             for r in results[:max_sources]
         ]
+        if fetch_pages:
+            page_fetcher.fetch_contents(
+                documents,
+                max_workers=getattr(settings, "RESEARCH_FETCH_WORKERS", page_fetcher.DEFAULT_MAX_WORKERS),
+                max_bytes=getattr(settings, "RESEARCH_FETCH_MAX_BYTES", page_fetcher.DEFAULT_MAX_BYTES),
+                timeout=getattr(settings, "RESEARCH_FETCH_TIMEOUT", page_fetcher.DEFAULT_TIMEOUT),
+            )
         return documents
 
     except requests.exceptions.RequestException as e:
@@ -0,0 +1,132 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, transaction
+
+from ...agents import knowledge_manager
+from ...models import Query
+
+
+class Command(BaseCommand):
+    """
+    Measure Query/Document/Summary write throughput with several worker
+    processes sharing one SQLite file, for the stock and the tuned database
+    configuration (see backend/database.py).
+
+    The default "view" pattern writes the way QueryView does: autocommit
+    Query.objects.create, then store_documents, then store_summary. The
+    "atomic" pattern wraps a lookup and those writes in one transaction,
+    a read-then-write shape the app does not currently use.
+
+        python manage.py bench_db_writes --workers 4 --writes 200
+        python manage.py bench_db_writes --pattern atomic
+    """
+
+    help = "Benchmark concurrent SQLite writes through knowledge_manager."
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=4)
+        parser.add_argument("--writes", type=int, default=100, help="Writes per worker.")
+        parser.add_argument("--docs", type=int, default=4, help="Documents per write.")
+        parser.add_argument("--modes", default="stock,tuned")
+        parser.add_argument("--pattern", choices=["view", "atomic"], default="view")
+        # Internal: run as one worker process and print a JSON result.
+        parser.add_argument("--worker", action="store_true", help="Internal.")
+        parser.add_argument("--start-at", type=float, default=0.0, help="Internal.")
+
+    def handle(self, *args, **opts):
+        if opts["worker"]:
+            return self._run_worker(opts)
+
+        for mode in opts["modes"].split(","):
+            with tempfile.TemporaryDirectory() as tmp:
+                result = self._run_mode(mode.strip(), Path(tmp) / "bench.sqlite3", opts)
+            self.stdout.write(
+                f"[{result['mode']}/{opts['pattern']}] {result['workers']} workers: "
+                f"{result['ok']} writes in {result['elapsed']:.2f}s "
+                f"({result['throughput']:.1f} writes/s), "
+                f"{result['locked']} 'database is locked' errors"
+            )
+
+    def _run_mode(self, mode, db_path, opts):
+        env = dict(
+            os.environ,
+            SQLITE_PATH=str(db_path),
+            SQLITE_TUNING="true" if mode == "tuned" else "false",
+        )
+        manage = [sys.executable, str(Path(settings.BASE_DIR) / "manage.py")]
+        subprocess.run(manage + ["migrate", "--skip-checks", "-v", "0"], env=env, check=True)
+
+        start_at = time.time() + 1.0
+        procs = [
+            subprocess.Popen(
+                manage + [
+                    "bench_db_writes", "--worker",
+                    "--writes", str(opts["writes"]),
+                    "--docs", str(opts["docs"]),
+                    "--pattern", opts["pattern"],
+                    "--start-at", str(start_at),
+                ],
+                env=env,
+                stdout=subprocess.PIPE,
+                text=True,
+            )
+            for _ in range(opts["workers"])
+        ]
+        results = []
+        for p in procs:
+            out, _ = p.communicate()
+            results.append(json.loads(out.strip().splitlines()[-1]))
+
+        elapsed = max(r["end"] for r in results) - min(r["start"] for r in results)
+        ok = sum(r["ok"] for r in results)
+        return {
+            "mode": mode,
+            "workers": len(results),
+            "ok": ok,
+            "locked": sum(r["locked"] for r in results),
+            "elapsed": elapsed,
+            "throughput": ok / elapsed if elapsed > 0 else 0.0,
+        }
+
+    def _run_worker(self, opts):
+        docs = [
+            {"source": f"Source {i}", "url": f"https://example.com/{i}", "content": "lorem ipsum " * 200}
+            for i in range(opts["docs"])
+        ]
+        delay = opts["start_at"] - time.time()
+        if delay > 0:
+            time.sleep(delay)
+
+        write = self._write_atomic if opts["pattern"] == "atomic" else self._write_view
+        ok = locked = 0
+        start = time.time()
+        for i in range(opts["writes"]):
+            try:
+                write(f"benchmark query {os.getpid()}-{i}", docs)
+                ok += 1
+            except OperationalError as e:
+                if "locked" not in str(e):
+                    raise
+                locked += 1
+        end = time.time()
+        self.stdout.write(json.dumps({"ok": ok, "locked": locked, "start": start, "end": end}))
+
+    def _write_view(self, q_text, docs):
+        q_obj = Query.objects.create(query_text=q_text)
+        knowledge_manager.store_documents(q_obj, docs)
+        knowledge_manager.store_summary(q_obj, "benchmark summary")
+
+    def _write_atomic(self, q_text, docs):
+        with transaction.atomic():
+            if Query.objects.filter(query_text=q_text).exists():
+                return
+            self._write_view(q_text, docs)
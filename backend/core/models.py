@@ -4,6 +4,11 @@ class Query(models.Model):
     query_text = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["-created_at"], name="core_query_created_idx"),
+        ]
+
     def __str__(self):
         return f"Query {self.id}: {self.query_text[:50]}"
 
@@ -1,3 +1,279 @@
-from django.test import TestCase
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
 
-# Create your tests here.
+from unittest import mock
+
+from django.db import connection
+from django.db.utils import ConnectionHandler
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from backend.database import sqlite_database
+
+from .agents import page_fetcher, research_gathering
+
+ARTICLE_HTML = b"""<!doctype html>
+<html><head><title>Fixture</title><style>body { color: red; }</style></head>
+<body>
+<nav><a href="/">Home</a> <a href="/about">About us and other links</a></nav>
+<article>
+<h1>Solar power in remote villages</h1>
+<p>Solar microgrids now supply electricity to thousands of remote villages.</p>
+<p>Battery storage lets clinics keep vaccines cold through the night.</p>
+<script>var tracking = "should never appear in the text";</script>
+</article>
+<footer>Copyright notice and cookie banner text here</footer>
+</body></html>"""
+
+BODY_TEXT = b"<p>Wind turbines generate a growing share of national electricity.</p>"
+# Valid HTML that omits optional end tags, or wraps the body in a <form>.
+OPTIONAL_END_TAG_PAGES = {
+    "/no-option-end": b"<select><option>one<option>two</select>" + BODY_TEXT,
+    "/no-head-end": b"<html><head><title>x</title><body>" + BODY_TEXT,
+    "/form-wrapped": b"<form id=aspnetForm><div>" + BODY_TEXT + b"</div></form>",
+}
+
+
+class _FixtureHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path == "/article":
+            self._send(200, "text/html; charset=utf-8", ARTICLE_HTML)
+        elif self.path == "/large":
+            body = b"<p>" + b"lorem ipsum dolor sit amet " * 20000 + b"</p>"
+            self._send(200, "text/html", body)
+        elif self.path == "/slow":
+            time.sleep(0.3)
+            self._send(200, "text/html", ARTICLE_HTML)
+        elif self.path in OPTIONAL_END_TAG_PAGES:
+            self._send(200, "text/html", OPTIONAL_END_TAG_PAGES[self.path])
+        elif self.path == "/trickle":
+            # Each chunk arrives well within the read timeout, but the whole
+            # body takes far longer than the fetch deadline.
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.end_headers()
+            chunk = b"<p>" + b"tidal energy is predictable and steady " * 420 + b"</p>"
+            try:
+                for _ in range(20):
+                    self.wfile.write(chunk)
+                    self.wfile.flush()
+                    time.sleep(0.1)
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+        elif self.path == "/slow-drip":
+            # Announces the full length, then sends it 50 bytes every 0.1 s for
+            # 3 s, far below the fetcher's read chunk size.
+            piece = b"<p>tidal energy is steady and predictable.</p>".ljust(50)
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.send_header("Content-Length", str(len(piece) * 30))
+            self.end_headers()
+            try:
+                for _ in range(30):
+                    self.wfile.write(piece)
+                    self.wfile.flush()
+                    time.sleep(0.1)
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+        elif self.path == "/malformed":
+            body = b"<p>Some perfectly ordinary text before the junk.</p><![bogus[ x ]]><p>after</p>"
+            self._send(200, "text/html", body)
+        elif self.path == "/binary":
+            self._send(200, "application/pdf", b"%PDF-1.4")
+        else:
+            self._send(404, "text/html", b"<p>not found</p>")
+
+    def _send(self, code, ctype, body):
+        self.send_response(code)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, *args):
+        pass
+
+
+class _FixtureServerMixin:
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _FixtureHandler)
+        cls.base = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+
+class PageFetcherTests(_FixtureServerMixin, SimpleTestCase):
+    def test_extracts_main_text(self):
+        text, stats = page_fetcher.fetch_page_text(self.base + "/article")
+        self.assertIn("Solar microgrids now supply electricity", text)
+        self.assertIn("Battery storage lets clinics", text)
+        self.assertNotIn("tracking", text)
+        self.assertNotIn("color: red", text)
+        self.assertNotIn("Copyright", text)
+        self.assertNotIn("About us", text)
+        self.assertIsNone(stats["error"])
+        self.assertGreater(stats["elapsed_ms"], 0)
+
+    def test_optional_end_tags_keep_body_text(self):
+        for path in OPTIONAL_END_TAG_PAGES:
+            with self.subTest(path=path):
+                text, stats = page_fetcher.fetch_page_text(self.base + path)
+                self.assertIsNone(stats["error"])
+                self.assertIn("Wind turbines generate", text)
+                self.assertNotIn("two", text)
+
+    def test_respects_size_cap(self):
+        text, stats = page_fetcher.fetch_page_text(
+            self.base + "/large", max_bytes=32 * 1024, max_chars=10 ** 6
+        )
+        self.assertTrue(stats["truncated"])
+        self.assertLessEqual(stats["bytes"], 32 * 1024)
+        self.assertIn("lorem ipsum", text)
+
+    def test_timeout_and_errors_return_empty_text(self):
+        text, stats = page_fetcher.fetch_page_text(self.base + "/slow", timeout=0.05)
+        self.assertEqual(text, "")
+        self.assertIsNotNone(stats["error"])
+
+        text, stats = page_fetcher.fetch_page_text(self.base + "/missing")
+        self.assertEqual(text, "")
+        self.assertIn("404", stats["error"])
+
+        text, stats = page_fetcher.fetch_page_text(self.base + "/binary")
+        self.assertEqual(text, "")
+        self.assertIn("unsupported content type", stats["error"])
+
+    def test_deadline_bounds_total_fetch_time(self):
+        text, stats = page_fetcher.fetch_page_text(
+            self.base + "/trickle", timeout=0.5, max_chars=10 ** 6
+        )
+        self.assertTrue(stats["truncated"])
+        self.assertIsNone(stats["error"])
+        self.assertIn("tidal energy", text)
+        self.assertLess(stats["elapsed_ms"], 1500)
+
+    def test_deadline_holds_for_small_slow_writes(self):
+        text, stats = page_fetcher.fetch_page_text(self.base + "/slow-drip", timeout=1.0)
+        self.assertTrue(stats["truncated"])
+        self.assertIsNone(stats["error"])
+        self.assertIn("tidal energy is steady", text)
+        self.assertLess(stats["bytes"], 50 * 30)
+        self.assertLess(stats["elapsed_ms"], 1300)
+
+    def test_malformed_markup_is_a_failed_fetch(self):
+        text, stats = page_fetcher.fetch_page_text(self.base + "/malformed")
+        self.assertEqual(text, "")
+        self.assertIn("unparseable HTML", stats["error"])
+
+        docs = [
+            {"source": "A", "url": self.base + "/malformed", "content": "kept snippet"},
+            {"source": "B", "url": self.base + "/article", "content": "short snippet"},
+        ]
+        page_fetcher.fetch_contents(docs, max_workers=2)
+        self.assertEqual(docs[0]["content"], "kept snippet")
+        self.assertIn("Solar microgrids", docs[1]["content"])
+
+    def test_fetch_contents_fills_documents(self):
+        docs = [
+            {"source": "A", "url": self.base + "/article", "content": "short snippet"},
+            {"source": "B", "url": self.base + "/missing", "content": "kept snippet"},
+            {"source": "C", "url": "", "content": "no link"},
+        ]
+        page_fetcher.fetch_contents(docs, max_workers=2)
+        self.assertIn("Solar microgrids", docs[0]["content"])
+        self.assertEqual(docs[1]["content"], "kept snippet")
+        self.assertEqual(docs[2]["content"], "no link")
+        self.assertIn("elapsed_ms", docs[0]["fetch_stats"])
+        self.assertNotIn("fetch_stats", docs[2])
+
+    def test_fetches_run_concurrently(self):
+        docs = [{"source": str(i), "url": self.base + "/slow", "content": ""} for i in range(4)]
+        started = time.perf_counter()
+        page_fetcher.fetch_contents(docs, max_workers=4)
+        elapsed = time.perf_counter() - started
+        self.assertLess(elapsed, 1.0)
+        self.assertTrue(all("Solar microgrids" in d["content"] for d in docs))
+
+
+class GatherFetchPagesTests(_FixtureServerMixin, SimpleTestCase):
+    """gather() with SerpAPI mocked to return links to the fixture server."""
+
+    def _serpapi_response(self):
+        resp = mock.Mock()
+        resp.json.return_value = {"organic_results": [
+            {"title": "Article", "link": self.base + "/article", "snippet": "short snippet"},
+            {"title": "Missing", "link": self.base + "/missing", "snippet": "kept snippet"},
+        ]}
+        return resp
+
+    def _gather(self, **kwargs):
+        with mock.patch.object(research_gathering, "_load_serpapi_env", return_value="key"), \
+                mock.patch.object(research_gathering.requests, "get",
+                                  return_value=self._serpapi_response()):
+            return research_gathering.gather("solar", max_sources=2, **kwargs)
+
+    def test_snippets_only_by_default(self):
+        docs = self._gather()
+        self.assertEqual([d["content"] for d in docs], ["short snippet", "kept snippet"])
+
+    @override_settings(RESEARCH_FETCH_PAGES=True, RESEARCH_FETCH_WORKERS=2,
+                       RESEARCH_FETCH_MAX_BYTES=4096, RESEARCH_FETCH_TIMEOUT=3.0)
+    def test_fetch_pages_setting(self):
+        with mock.patch.object(page_fetcher, "fetch_contents",
+                               wraps=page_fetcher.fetch_contents) as fetch:
+            docs = self._gather()
+        self.assertEqual(fetch.call_args.kwargs,
+                         {"max_workers": 2, "max_bytes": 4096, "timeout": 3.0})
+        self.assertIn("Solar microgrids", docs[0]["content"])
+        self.assertEqual(docs[1]["content"], "kept snippet")
+        self.assertIn("elapsed_ms", docs[0]["fetch_stats"])
+
+    @override_settings(RESEARCH_FETCH_PAGES=True)
+    def test_explicit_argument_overrides_setting(self):
+        docs = self._gather(fetch_pages=False)
+        self.assertEqual(docs[0]["content"], "short snippet")
+
+
+class DatabaseConfigTests(TestCase):
+    def test_stock_config_is_untouched(self):
+        config = sqlite_database("db.sqlite3", tuned=False)
+        self.assertEqual(config, {"ENGINE": "django.db.backends.sqlite3", "NAME": "db.sqlite3"})
+
+    def test_pragmas_applied_on_connect(self):
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA synchronous")
+            self.assertEqual(cursor.fetchone()[0], 1)  # NORMAL
+            cursor.execute("PRAGMA busy_timeout")
+            # Python's sqlite3 default is 5000; settings configure 20 seconds.
+            self.assertEqual(cursor.fetchone()[0], 20000)
+
+    def test_file_database_uses_wal(self):
+        # The test database is in-memory, where WAL does not apply.
+        with tempfile.TemporaryDirectory() as tmp:
+            handler = ConnectionHandler({"default": sqlite_database(Path(tmp) / "wal.sqlite3")})
+            conn = handler["default"]
+            try:
+                with conn.cursor() as cursor:
+                    cursor.execute("PRAGMA journal_mode")
+                    self.assertEqual(cursor.fetchone()[0], "wal")
+                self.assertEqual(conn.transaction_mode, "IMMEDIATE")
+            finally:
+                conn.close()
+
+    def test_query_list_index_exists(self):
+        with connection.cursor() as cursor:
+            query_idx = connection.introspection.get_constraints(cursor, "core_query")
+        self.assertEqual(query_idx["core_query_created_idx"]["orders"], ["DESC"])
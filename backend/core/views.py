@@ -58,9 +58,9 @@ class QueryView(APIView):
             )
 
 class QueryListView(ListAPIView):
-    queryset = Query.objects.all().order_by("-created_at")
+    queryset = Query.objects.prefetch_related("documents", "summaries").order_by("-created_at")
     serializer_class = QuerySerializer
 
 class QueryDetailView(RetrieveAPIView):
-    queryset = Query.objects.all()
+    queryset = Query.objects.prefetch_related("documents", "summaries")
     serializer_class = QuerySerializer